@@ -0,0 +1,123 @@
+"""
+Tail latency benchmark for admission control under abuse.
+
+A few well-behaved teachers sign students up and remove them again at a
+steady pace from their own IPs. The run is repeated while abusive clients
+flood /auth/login with wrong passwords and /activities/.../signup with a
+real teacher's name. Latency percentiles (p50, p99 and max) are reported
+for the well-behaved clients only; the p99 under abuse is the number to
+compare with the quiet run.
+
+Clients run in the same process as the app, so the abusers' total rate is
+capped (--abuse-rate) to keep them from simply starving the CPU; what is
+measured is how the server treats abusive requests, not raw flooding.
+
+    python bench/bench_admission.py --duration 5
+    python bench/bench_admission.py --no-admission   # for comparison
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+if "--no-admission" in sys.argv:
+    for name in ("RATE_LIMIT_IP_BURST", "RATE_LIMIT_TEACHER_BURST", "RATE_LIMIT_LOGIN_BURST",
+                 "ADMISSION_MAX_CONCURRENT", "ADMISSION_MAX_QUEUED",
+                 "PASSWORD_VERIFY_CONCURRENCY", "PASSWORD_VERIFY_PER_SECOND"):
+        os.environ[name] = "1000000"
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from src.app import app  # noqa: E402
+
+TEACHERS = ["mrodriguez", "mchen", "principal"]
+
+
+def client_for(ip):
+    transport = httpx.ASGITransport(app=app, client=(ip, 50000))
+    return httpx.AsyncClient(transport=transport, base_url="http://testserver")
+
+
+async def well_behaved(index, deadline, interval, latencies):
+    """Sign a student up and remove them again, one request every interval"""
+    teacher = TEACHERS[index % len(TEACHERS)]
+    email = f"bench{index}@mergington.edu"
+    async with client_for(f"10.0.0.{index + 1}") as client:
+        action = "signup"
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.post(f"/activities/Programming Class/{action}",
+                              params={"email": email, "teacher_username": teacher})
+            latencies.append(time.perf_counter() - started)
+            action = "unregister" if action == "signup" else "signup"
+            await asyncio.sleep(max(0, interval - (time.perf_counter() - started)))
+
+
+async def abuser(kind, deadline, interval, statuses):
+    """Send a request every interval, without waiting for earlier ones"""
+    async with client_for("6.6.6.6" if kind == "login" else "6.6.6.7") as client:
+        pending = set()
+        while time.perf_counter() < deadline:
+            pending.add(asyncio.create_task(abusive_request(client, kind, statuses)))
+            pending = {task for task in pending if not task.done()}
+            await asyncio.sleep(interval)
+        await asyncio.gather(*pending)
+
+
+async def abusive_request(client, kind, statuses):
+    if kind == "login":
+        response = await client.post(
+            "/auth/login", params={"username": "mchen", "password": "wrong"})
+    else:
+        response = await client.post(
+            "/activities/Chess Club/signup",
+            params={"email": "spam@example.com", "teacher_username": "mchen"})
+    statuses[response.status_code] += 1
+
+
+async def run(args, abusive):
+    deadline = time.perf_counter() + args.duration
+    latencies = []
+    statuses = Counter()
+    tasks = [well_behaved(i, deadline, 1 / args.rate, latencies) for i in range(args.clients)]
+    if abusive:
+        # Half of the abusive traffic is logins, half is signups
+        interval = 2 / args.abuse_rate
+        tasks += [abuser("login", deadline, interval, statuses),
+                  abuser("signup", deadline, interval, statuses)]
+    await asyncio.gather(*tasks)
+    return sorted(latencies), statuses
+
+
+def percentile(values, fraction):
+    return values[max(0, int(len(values) * fraction) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=5, help="requests/s per well-behaved client")
+    parser.add_argument("--abuse-rate", type=float, default=200,
+                        help="total abusive requests/s")
+    parser.add_argument("--no-admission", action="store_true",
+                        help="raise every limit so admission control never rejects")
+    args = parser.parse_args()
+
+    print(f"{'scenario':>10} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}  abuser responses")
+    for abusive in (False, True):
+        latencies, statuses = asyncio.run(run(args, abusive))
+        print(f"{'abuse' if abusive else 'quiet':>10} {len(latencies):>9} "
+              f"{statistics.median(latencies) * 1000:>8.1f} {percentile(latencies, 0.99):>8.1f} "
+              f"{latencies[-1] * 1000:>8.1f}  {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
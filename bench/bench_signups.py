@@ -0,0 +1,108 @@
+"""
+Load benchmark for batched signup writes.
+
+Fires concurrent signups at a few hot activities through the API, once with
+batching disabled (a 0 ms window) and once with the configured window, and
+reports throughput, latency and the number of database round trips.
+
+The in-memory store answers instantly, so each database call is delayed by
+--db-latency-ms to model the round trip to MongoDB.
+
+    python bench/bench_signups.py --requests 2000 --concurrency 64
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Keep admission control out of the way; this measures the write path only
+for name in ("RATE_LIMIT_IP_BURST", "RATE_LIMIT_TEACHER_BURST",
+             "ADMISSION_MAX_CONCURRENT", "ADMISSION_MAX_QUEUED"):
+    os.environ.setdefault(name, "1000000")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.app import app  # noqa: E402
+from src.backend.database_inmemory import activities_collection  # noqa: E402
+from src.backend.routers import activities  # noqa: E402
+from src.backend.write_batcher import BATCH_WINDOW_SECONDS, WriteBatcher  # noqa: E402
+
+
+class SlowCollection:
+    """Adds a fixed delay to each database call and counts them"""
+
+    def __init__(self, collection, latency_seconds):
+        self.collection = collection
+        self.latency_seconds = latency_seconds
+        self.round_trips = 0
+
+    def find_one(self, query):
+        self.round_trips += 1
+        time.sleep(self.latency_seconds)
+        return self.collection.find_one(query)
+
+    def bulk_update(self, updates, documents=None):
+        self.round_trips += 1
+        time.sleep(self.latency_seconds)
+        return self.collection.bulk_update(updates, documents)
+
+
+def run(client, window_seconds, args, run_id):
+    names = [f"Bench {run_id} {i}" for i in range(args.activities)]
+    for name in names:
+        activities_collection.insert_one(
+            {"_id": name, "max_participants": args.requests, "participants": []})
+
+    collection = SlowCollection(activities_collection, args.db_latency_ms / 1000)
+    activities.participant_writes = WriteBatcher(collection, window_seconds)
+
+    def sign_up(i):
+        started = time.perf_counter()
+        response = client.post(
+            f"/activities/{names[i % len(names)]}/signup",
+            params={"email": f"student{i}@mergington.edu", "teacher_username": "mchen"})
+        return response.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(sign_up, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    failures = sum(1 for status, _ in results if status != 200)
+    return {
+        "throughput": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "round_trips": collection.round_trips,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--activities", type=int, default=3)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW_SECONDS * 1000)
+    args = parser.parse_args()
+
+    print(f"{'window':>10} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'db trips':>9} {'failed':>7}")
+    for run_id, window_ms in enumerate((0, args.window_ms)):
+        # One client (and event loop) per run, shared by all worker threads
+        with TestClient(app) as client:
+            result = run(client, window_ms / 1000, args, run_id)
+        print(f"{window_ms:>8.1f}ms {result['throughput']:>10.0f} {result['p50_ms']:>8.1f} "
+              f"{result['p99_ms']:>8.1f} {result['round_trips']:>9} {result['failures']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ import os
 from pathlib import Path
 from .backend import routers
 from .backend import database_inmemory as database
+from .backend.admission import AdmissionControlMiddleware
 
 # Initialize web host
 app = FastAPI(
@@ -19,6 +20,9 @@ app = FastAPI(
     description="API for viewing and signing up for extracurricular activities"
 )
 
+# Rate limit and bound concurrency of mutating requests
+app.add_middleware(AdmissionControlMiddleware)
+
 # Initialize database with sample data if empty
 database.init_database()
 
@@ -0,0 +1,167 @@
+"""
+Admission control for mutating requests.
+
+Every POST/PUT/PATCH/DELETE request must pass a per-client-IP token bucket
+before it reaches a route. Logins then need a token from a bucket keyed on
+(client IP, username), a token from a global verifications-per-second bucket
+and a free slot in a small, separate password verification budget. All other mutating requests wait briefly for a slot in
+a bounded concurrency queue. Requests that cannot be admitted are rejected
+immediately with 429 (rate limited) or 503 (server saturated) instead of
+piling up.
+
+Per-teacher limits are charged by the routes once the teacher has been
+validated (see teacher_limiter). They are keyed on (teacher, client IP), so a
+client cannot use up a real teacher's budget by sending requests in their name.
+
+The concurrency counters are only touched from the event loop. Token buckets
+are also charged from route handlers in the threadpool, so each limiter
+guards its buckets with a short lock.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+LOGIN_PATH = "/auth/login"
+
+IP_RATE_PER_SECOND = float(os.environ.get("RATE_LIMIT_IP_PER_SECOND", "20"))
+IP_BURST = int(os.environ.get("RATE_LIMIT_IP_BURST", "40"))
+TEACHER_RATE_PER_SECOND = float(os.environ.get("RATE_LIMIT_TEACHER_PER_SECOND", "10"))
+TEACHER_BURST = int(os.environ.get("RATE_LIMIT_TEACHER_BURST", "20"))
+LOGIN_RATE_PER_SECOND = float(os.environ.get("RATE_LIMIT_LOGIN_PER_SECOND", "1"))
+LOGIN_BURST = int(os.environ.get("RATE_LIMIT_LOGIN_BURST", "5"))
+MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", "32"))
+MAX_QUEUED = int(os.environ.get("ADMISSION_MAX_QUEUED", "64"))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_MS", "500")) / 1000
+
+# Argon2 verification is deliberately expensive: with the stored hash parameters
+# (64 MiB, 3 passes, 4 lanes) one verify costs about 0.2 CPU-seconds. By default
+# at most a quarter of the cores verify at once, and the rate keeps verification
+# to roughly a tenth of the total CPU time.
+CPU_COUNT = os.cpu_count() or 1
+PASSWORD_VERIFY_CONCURRENCY = int(os.environ.get(
+    "PASSWORD_VERIFY_CONCURRENCY", str(max(1, CPU_COUNT // 4))))
+PASSWORD_VERIFY_PER_SECOND = float(os.environ.get(
+    "PASSWORD_VERIFY_PER_SECOND", str(max(0.5, CPU_COUNT / 2))))
+
+# The least recently seen client is forgotten once this many are being tracked
+MAX_TRACKED_KEYS = 10000
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now):
+        return min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+
+    def take(self, now):
+        """Consume one token if available"""
+        self.tokens = self._refill(now)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class RateLimiter:
+    def __init__(self, rate, burst, max_tracked_keys=MAX_TRACKED_KEYS):
+        self.rate = rate
+        self.burst = burst
+        self.max_tracked_keys = max_tracked_keys
+        self.buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key, now=None):
+        """Return True if the client identified by key may make a request"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                if len(self.buckets) >= self.max_tracked_keys:
+                    self.buckets.popitem(last=False)
+                bucket = self.buckets[key] = TokenBucket(self.rate, self.burst, now)
+            else:
+                self.buckets.move_to_end(key)
+            return bucket.take(now)
+
+
+# Charged by routes after the teacher has been authenticated
+teacher_limiter = RateLimiter(TEACHER_RATE_PER_SECOND, TEACHER_BURST)
+
+
+def reject(status_code, detail):
+    """Build a fast rejection response in the same shape as HTTPException"""
+    return JSONResponse({"detail": detail}, status_code=status_code, headers={"Retry-After": "1"})
+
+
+class AdmissionControlMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, max_concurrent=MAX_CONCURRENT, max_queued=MAX_QUEUED,
+                 queue_timeout=QUEUE_TIMEOUT_SECONDS, max_logins=PASSWORD_VERIFY_CONCURRENCY):
+        super().__init__(app)
+        self.ip_limiter = RateLimiter(IP_RATE_PER_SECOND, IP_BURST)
+        self.login_limiter = RateLimiter(LOGIN_RATE_PER_SECOND, LOGIN_BURST)
+        self.verify_budget = TokenBucket(PASSWORD_VERIFY_PER_SECOND, max_logins, time.monotonic())
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.max_logins = max_logins
+        self.logins = 0
+
+    async def dispatch(self, request, call_next):
+        if request.method not in MUTATING_METHODS:
+            return await call_next(request)
+
+        now = time.monotonic()
+        client_ip = request.client.host if request.client else "unknown"
+        if not self.ip_limiter.allow(client_ip, now):
+            return reject(429, "Too many requests")
+
+        if request.url.path == LOGIN_PATH:
+            return await self.admit_login(request, call_next, client_ip, now)
+
+        # Only wait for a slot if there is room in the queue
+        if self.slots.locked() and self.waiting >= self.max_queued:
+            return reject(503, "Server is busy, please try again")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return reject(503, "Server is busy, please try again")
+        finally:
+            self.waiting -= 1
+
+        try:
+            return await call_next(request)
+        finally:
+            self.slots.release()
+
+    async def admit_login(self, request, call_next, client_ip, now):
+        """Run a login within its own budget, without taking a general slot"""
+        username = request.query_params.get("username", "")
+        if not self.login_limiter.allow((client_ip, username), now):
+            return reject(429, "Too many login attempts")
+
+        if self.logins >= self.max_logins or not self.verify_budget.take(now):
+            return reject(503, "Server is busy, please try again")
+
+        self.logins += 1
+        try:
+            return await call_next(request)
+        finally:
+            self.logins -= 1
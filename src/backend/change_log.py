@@ -0,0 +1,58 @@
+"""
+Bounded, sequence-numbered log of activity changes.
+
+Every write to the activities collection appends the changed activity to
+the log. Clients remember the log id and the last sequence number they saw
+and ask only for what changed since then. Sequence numbers restart when the
+process does, so each log has a random id; a client holding a different id,
+or one that fell behind entries already dropped from the log, has to reload
+everything.
+"""
+
+import copy
+import os
+import threading
+import uuid
+from collections import deque
+
+CHANGE_LOG_SIZE = int(os.environ.get("CHANGE_LOG_SIZE", "1000"))
+
+
+class ChangeLog:
+    def __init__(self, max_entries=CHANGE_LOG_SIZE):
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self.log_id = uuid.uuid4().hex
+        self.seq = 0
+
+    def append(self, doc_id, document):
+        """Record the new state of a document and return its sequence number"""
+        snapshot = copy.deepcopy({k: v for k, v in document.items() if k != "_id"})
+        with self._lock:
+            self.seq += 1
+            self._entries.append({"seq": self.seq, "name": doc_id, "activity": snapshot})
+            return self.seq
+
+    def changes_since(self, seq, log_id=None):
+        """
+        Return (latest_seq, changes) for everything after seq.
+
+        Only the latest change per document is included. changes is None when
+        log_id belongs to another log (or is missing for a nonzero seq), or seq
+        is older than the log or newer than anything recorded, meaning the
+        client must resync from the full listing.
+        """
+        with self._lock:
+            latest = self.seq
+            if log_id != self.log_id and (log_id is not None or seq != 0):
+                return latest, None
+            oldest = self._entries[0]["seq"] if self._entries else latest + 1
+            if seq > latest or seq < oldest - 1:
+                return latest, None
+            entries = [entry for entry in self._entries if entry["seq"] > seq]
+
+        latest_by_name = {}
+        for entry in entries:
+            latest_by_name.pop(entry["name"], None)
+            latest_by_name[entry["name"]] = entry
+        return latest, list(latest_by_name.values())
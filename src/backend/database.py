@@ -2,13 +2,70 @@
 MongoDB database configuration and setup for Mergington High School API
 """
 
-from pymongo import MongoClient
+from types import SimpleNamespace
+
+from pymongo import MongoClient, ReturnDocument, UpdateOne
 from argon2 import PasswordHasher
 
+from .change_log import ChangeLog
+
+class ChangeLoggedCollection:
+    """
+    Wraps a MongoDB collection and records every write in a change log.
+
+    Writes are logged from state the write already returned or the caller
+    already knows, so logging costs no extra reads. Write methods that are not
+    wrapped here are refused rather than passed through unlogged.
+    """
+
+    UNLOGGED_WRITES = {
+        "insert_many", "update_many", "replace_one", "delete_one", "delete_many",
+        "find_one_and_update", "find_one_and_replace", "find_one_and_delete",
+        "bulk_write",
+    }
+
+    def __init__(self, collection, change_log):
+        self.collection = collection
+        self.change_log = change_log
+
+    def __getattr__(self, name):
+        if name in self.UNLOGGED_WRITES:
+            raise AttributeError(
+                f"{name} would bypass the activity change log; use insert_one, "
+                "update_one or bulk_update")
+        return getattr(self.collection, name)
+
+    def insert_one(self, doc):
+        result = self.collection.insert_one(doc)
+        self.change_log.append(result.inserted_id, doc)
+        return result
+
+    def update_one(self, query, update):
+        doc = self.collection.find_one_and_update(
+            query, update, return_document=ReturnDocument.AFTER)
+        if doc:
+            self.change_log.append(doc["_id"], doc)
+        return SimpleNamespace(matched_count=int(doc is not None),
+                               modified_count=int(doc is not None))
+
+    def bulk_update(self, updates, documents):
+        """
+        Apply a list of (query, update) pairs as one ordered bulk write.
+
+        documents maps each updated _id to its full state after the updates,
+        as computed by the caller, and is what gets logged.
+        """
+        result = self.collection.bulk_write(
+            [UpdateOne(query, update) for query, update in updates], ordered=True)
+        for doc_id in dict.fromkeys(query["_id"] for query, _ in updates):
+            self.change_log.append(doc_id, documents[doc_id])
+        return result
+
 # Connect to MongoDB
 client = MongoClient('mongodb://localhost:27017/')
 db = client['mergington_high']
-activities_collection = db['activities']
+activity_changes = ChangeLog()
+activities_collection = ChangeLoggedCollection(db['activities'], activity_changes)
 teachers_collection = db['teachers']
 
 # Methods
@@ -5,13 +5,16 @@ This replaces MongoDB with simple dictionaries to avoid database setup complexit
 
 from argon2 import PasswordHasher
 
+from .change_log import ChangeLog
+
 # In-memory storage
 activities_data = {}
 teachers_data = {}
 
 class MockCollection:
-    def __init__(self, data_store):
+    def __init__(self, data_store, change_log=None):
         self.data_store = data_store
+        self.change_log = change_log
     
     def find(self, query=None):
         """Return all items as MongoDB would, with _id as key"""
@@ -40,6 +43,8 @@ class MockCollection:
         """Insert a document"""
         doc_id = doc.pop("_id")
         self.data_store[doc_id] = doc
+        if self.change_log is not None:
+            self.change_log.append(doc_id, doc)
         return type('InsertResult', (), {'inserted_id': doc_id})()
     
     def update_one(self, query, update):
@@ -49,17 +54,31 @@ class MockCollection:
             if key in self.data_store:
                 if "$push" in update:
                     for field, value in update["$push"].items():
-                        if field in self.data_store[key]:
-                            self.data_store[key][field].append(value)
-                        else:
-                            self.data_store[key][field] = [value]
+                        values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                        self.data_store[key].setdefault(field, []).extend(values)
                 if "$pull" in update:
                     for field, value in update["$pull"].items():
+                        values = value["$in"] if isinstance(value, dict) and "$in" in value else [value]
                         if field in self.data_store[key]:
-                            if value in self.data_store[key][field]:
-                                self.data_store[key][field].remove(value)
+                            self.data_store[key][field] = [
+                                item for item in self.data_store[key][field] if item not in values
+                            ]
+                if self.change_log is not None:
+                    self.change_log.append(key, self.data_store[key])
                 return type('UpdateResult', (), {'modified_count': 1})()
         return type('UpdateResult', (), {'modified_count': 0})()
+
+    def bulk_update(self, updates, documents=None):
+        """
+        Apply a list of (query, update) pairs in order, as one ordered bulk write.
+
+        documents (each updated _id's state afterwards) is only needed by the
+        MongoDB collection; here the change log reads the stored documents.
+        """
+        modified_count = 0
+        for query, update in updates:
+            modified_count += self.update_one(query, update).modified_count
+        return type('BulkWriteResult', (), {'modified_count': modified_count})()
     
     def aggregate(self, pipeline):
         """Simple aggregation for getting unique days"""
@@ -110,7 +129,8 @@ class MockCollection:
         return True
 
 # Create mock collections
-activities_collection = MockCollection(activities_data)
+activity_changes = ChangeLog()
+activities_collection = MockCollection(activities_data, change_log=activity_changes)
 teachers_collection = MockCollection(teachers_data)
 
 # Methods
@@ -125,7 +145,7 @@ def init_database():
     # Initialize activities if empty
     if len(activities_data) == 0:
         for name, details in initial_activities.items():
-            activities_data[name] = details
+            activities_collection.insert_one({"_id": name, **details})
             
     # Initialize teacher accounts if empty
     if len(teachers_data) == 0:
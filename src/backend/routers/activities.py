@@ -2,20 +2,51 @@
 Endpoints for the High School Management System API
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import RedirectResponse
 from typing import Dict, Any, Optional, List
 
-from ..database_inmemory import activities_collection, teachers_collection
+from ..admission import teacher_limiter
+from ..database_inmemory import activities_collection, teachers_collection, activity_changes
+from ..write_batcher import WriteBatcher, WriteRejected, SIGNUP, UNREGISTER
 
 router = APIRouter(
     prefix="/activities",
     tags=["activities"]
 )
 
+# Signups and unregistrations are coalesced into batched writes
+participant_writes = WriteBatcher(activities_collection)
+
+def submit_participant_write(activity_name: str, operation: str, email: str) -> Dict[str, Any]:
+    """Queue a participant change and translate rejections into HTTP errors"""
+    try:
+        return participant_writes.submit(activity_name, operation, email)
+    except WriteRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+def authenticated_teacher(request: Request, teacher_username: Optional[str] = Query(None)) -> Dict[str, Any]:
+    """Validate the teacher making the request, then charge their rate limit"""
+    if not teacher_username:
+        raise HTTPException(status_code=401, detail="Authentication required for this action")
+
+    teacher = teachers_collection.find_one({"_id": teacher_username})
+    if not teacher:
+        raise HTTPException(status_code=401, detail="Invalid teacher credentials")
+
+    # Only existing teachers are charged, and the teacher name is not a secret,
+    # so the bucket is per (teacher, client IP) to stop others draining it
+    client_ip = request.client.host if request.client else "unknown"
+    if not teacher_limiter.allow((teacher_username, client_ip)):
+        raise HTTPException(status_code=429, detail="Too many requests",
+                            headers={"Retry-After": "1"})
+
+    return teacher
+
 @router.get("", response_model=Dict[str, Any])
 @router.get("/", response_model=Dict[str, Any])
 def get_activities(
+    response: Response,
     day: Optional[str] = None,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
@@ -28,7 +59,14 @@ def get_activities(
     - start_time: Filter activities starting at or after this time (24-hour format, e.g., '14:30')
     - end_time: Filter activities ending at or before this time (24-hour format, e.g., '17:00')
     - difficulty: Filter activities by difficulty level ('Beginner', 'Intermediate', 'Advanced', or 'All')
+
+    The X-Change-Log-Id and X-Change-Seq headers give the change log position
+    to pass to GET /activities/changes for later updates.
     """
+    # Read the position before the data, so no later change can be missed
+    response.headers["X-Change-Log-Id"] = activity_changes.log_id
+    response.headers["X-Change-Seq"] = str(activity_changes.seq)
+
     # Build the query based on provided filters
     query = {}
     
@@ -72,66 +110,40 @@ def get_available_days() -> List[str]:
     
     return days
 
+@router.get("/changes", response_model=Dict[str, Any])
+def get_activity_changes(
+    since: int = Query(0, ge=0),
+    log_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get activities that changed after a sequence number from the change log
+
+    - since: The last sequence number the client has seen, from the X-Change-Seq
+      header of GET /activities or the seq of a previous call
+    - log_id: The log id that sequence number belongs to (X-Change-Log-Id or a
+      previous call's log_id). Only optional with since=0, which returns every
+      change since the server started, including the initial activities.
+
+    Each change holds the full current state of one activity. When resync_required
+    is true (the server restarted or the client is too far behind) the client must
+    reload GET /activities and continue from the position in its headers.
+    """
+    latest, changes = activity_changes.changes_since(since, log_id)
+    return {
+        "log_id": activity_changes.log_id,
+        "seq": latest,
+        "resync_required": changes is None,
+        "changes": changes or []
+    }
+
 @router.post("/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str, teacher_username: Optional[str] = Query(None)):
+def signup_for_activity(activity_name: str, email: str, teacher: Dict[str, Any] = Depends(authenticated_teacher)):
     """Sign up a student for an activity - requires teacher authentication"""
-    # Check teacher authentication
-    if not teacher_username:
-        raise HTTPException(status_code=401, detail="Authentication required for this action")
-    
-    teacher = teachers_collection.find_one({"_id": teacher_username})
-    if not teacher:
-        raise HTTPException(status_code=401, detail="Invalid teacher credentials")
-    
-    # Get the activity
-    activity = activities_collection.find_one({"_id": activity_name})
-    if not activity:
-        raise HTTPException(status_code=404, detail="Activity not found")
-
-    # Validate student is not already signed up
-    if email in activity["participants"]:
-        raise HTTPException(
-            status_code=400, detail="Already signed up for this activity")
-
-    # Add student to participants
-    result = activities_collection.update_one(
-        {"_id": activity_name},
-        {"$push": {"participants": email}}
-    )
-
-    if result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to update activity")
-    
-    return {"message": f"Signed up {email} for {activity_name}"}
+    # Add student to participants (validated against capacity when the batch commits)
+    return submit_participant_write(activity_name, SIGNUP, email)
 
 @router.post("/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str, teacher_username: Optional[str] = Query(None)):
+def unregister_from_activity(activity_name: str, email: str, teacher: Dict[str, Any] = Depends(authenticated_teacher)):
     """Remove a student from an activity - requires teacher authentication"""
-    # Check teacher authentication
-    if not teacher_username:
-        raise HTTPException(status_code=401, detail="Authentication required for this action")
-    
-    teacher = teachers_collection.find_one({"_id": teacher_username})
-    if not teacher:
-        raise HTTPException(status_code=401, detail="Invalid teacher credentials")
-    
-    # Get the activity
-    activity = activities_collection.find_one({"_id": activity_name})
-    if not activity:
-        raise HTTPException(status_code=404, detail="Activity not found")
-
-    # Validate student is signed up
-    if email not in activity["participants"]:
-        raise HTTPException(
-            status_code=400, detail="Not registered for this activity")
-
-    # Remove student from participants
-    result = activities_collection.update_one(
-        {"_id": activity_name},
-        {"$pull": {"participants": email}}
-    )
-
-    if result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to update activity")
-    
-    return {"message": f"Unregistered {email} from {activity_name}"}
\ No newline at end of file
+    # Remove student from participants (validated when the batch commits)
+    return submit_participant_write(activity_name, UNREGISTER, email)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Write coalescing for activity signups and unregistrations.
+
+During busy signup periods many requests target the same few activities.
+Instead of issuing one update per request, pending operations are collected
+for a short window and committed together as a single ordered bulk update.
+Each waiting request then receives its own result.
+
+Duplicate and capacity checks are made against the activity as read at the
+start of each commit, and commits are serialized by an in-process lock. This
+is only safe while a single server process writes to the activities
+collection; running several worker processes against the same MongoDB
+database could overfill an activity.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+# How long the first request of a batch waits for others to join it
+BATCH_WINDOW_SECONDS = float(os.environ.get("SIGNUP_BATCH_WINDOW_MS", "5")) / 1000
+
+SIGNUP = "signup"
+UNREGISTER = "unregister"
+
+logger = logging.getLogger(__name__)
+
+
+class WriteRejected(Exception):
+    """Raised for a single operation that could not be applied"""
+
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class WriteBatcher:
+    def __init__(self, collection, window_seconds=BATCH_WINDOW_SECONDS):
+        self.collection = collection
+        self.window_seconds = window_seconds
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+
+    def submit(self, activity_name, operation, email):
+        """Queue an operation and block until its batch has been committed"""
+        future = Future()
+        with self._pending_lock:
+            self._pending.append((activity_name, operation, email, future))
+            is_leader = len(self._pending) == 1
+
+        # The request that opens a batch waits out the window and commits it
+        if is_leader:
+            time.sleep(self.window_seconds)
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            with self._commit_lock:
+                try:
+                    self._commit(batch)
+                except Exception:
+                    logger.exception("Failed to commit a batch of %d participant writes", len(batch))
+                    for *_, pending_future in batch:
+                        if not pending_future.done():
+                            pending_future.set_exception(
+                                WriteRejected(500, "Failed to update activity"))
+
+        return future.result()
+
+    def _commit(self, batch):
+        """Apply a batch of operations as one ordered bulk update"""
+        # Group operations by activity, keeping arrival order
+        by_activity = {}
+        for activity_name, operation, email, future in batch:
+            by_activity.setdefault(activity_name, []).append((operation, email, future))
+
+        updates = []
+        documents = {}
+        accepted = []
+        for activity_name, operations in by_activity.items():
+            activity = self.collection.find_one({"_id": activity_name})
+            if not activity:
+                for _, _, future in operations:
+                    future.set_exception(WriteRejected(404, "Activity not found"))
+                continue
+
+            participants = list(activity["participants"])
+            max_participants = activity.get("max_participants")
+            runs = []
+            for operation, email, future in operations:
+                if operation == SIGNUP:
+                    if email in participants:
+                        future.set_exception(
+                            WriteRejected(400, "Already signed up for this activity"))
+                        continue
+                    if max_participants is not None and len(participants) >= max_participants:
+                        future.set_exception(WriteRejected(400, "Activity is full"))
+                        continue
+                    participants.append(email)
+                    message = f"Signed up {email} for {activity_name}"
+                else:
+                    if email not in participants:
+                        future.set_exception(
+                            WriteRejected(400, "Not registered for this activity"))
+                        continue
+                    participants.remove(email)
+                    message = f"Unregistered {email} from {activity_name}"
+
+                # Consecutive operations of the same kind share one update
+                if runs and runs[-1][0] == operation:
+                    runs[-1][1].append(email)
+                else:
+                    runs.append((operation, [email]))
+                accepted.append((future, {"message": message}))
+
+            for operation, emails in runs:
+                if operation == SIGNUP:
+                    update = {"$push": {"participants": {"$each": emails}}}
+                else:
+                    update = {"$pull": {"participants": {"$in": emails}}}
+                updates.append(({"_id": activity_name}, update))
+            if runs:
+                documents[activity_name] = {**activity, "participants": participants}
+
+        if updates:
+            self.collection.bulk_update(updates, documents)
+
+        for future, result in accepted:
+            future.set_result(result)
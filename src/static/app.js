@@ -47,6 +47,16 @@ document.addEventListener("DOMContentLoaded", () => {
   let currentTimeRange = "";
   let currentDifficulty = "";
 
+  // Rendering state
+  const activitiesCache = {}; // Last response for each query string
+  let activitiesRequest = null; // AbortController of the in-flight fetch
+  const renderedCards = new Map(); // Activity name -> { card, signature }
+  let visibleResults = []; // Filtered [name, details] entries in display order
+  let renderLimit = 0; // How many of visibleResults are currently in the DOM
+  let renderedFilterKey = null; // Search and filters that visibleResults matches
+  const RENDER_PAGE_SIZE = 60;
+  const SEARCH_DEBOUNCE_MS = 200;
+
   // Authentication state
   let currentUser = null;
 
@@ -309,9 +319,19 @@ document.addEventListener("DOMContentLoaded", () => {
     await login(username, password);
   });
 
+  // Delay calls to fn until wait ms have passed without another call
+  function debounce(fn, wait) {
+    let timeoutId = null;
+    return (...args) => {
+      clearTimeout(timeoutId);
+      timeoutId = setTimeout(() => fn(...args), wait);
+    };
+  }
+
   // Show loading skeletons
   function showLoadingSkeletons() {
     activitiesList.innerHTML = "";
+    renderedCards.clear();
 
     // Create more skeleton cards to fill the screen since they're smaller now
     for (let i = 0; i < 9; i++) {
@@ -420,8 +440,12 @@ document.addEventListener("DOMContentLoaded", () => {
 
   // Function to fetch activities from API with optional day, time, and difficulty filters
   async function fetchActivities() {
-    // Show loading skeletons first
-    showLoadingSkeletons();
+    // Cancel any older request so only the latest filter's response renders
+    if (activitiesRequest) {
+      activitiesRequest.abort();
+    }
+    const controller = new AbortController();
+    activitiesRequest = controller;
 
     try {
       // Build query string with filters if they exist
@@ -454,26 +478,43 @@ document.addEventListener("DOMContentLoaded", () => {
 
       const queryString =
         queryParams.length > 0 ? `?${queryParams.join("&")}` : "";
-      const response = await fetch(`/activities${queryString}`);
+
+      // Show the last known result for a repeated query, skeletons otherwise
+      if (activitiesCache[queryString]) {
+        allActivities = activitiesCache[queryString];
+        displayFilteredActivities();
+      } else {
+        showLoadingSkeletons();
+      }
+
+      const response = await fetch(`/activities${queryString}`, {
+        signal: controller.signal,
+      });
       const activities = await response.json();
 
       // Save the activities data
+      activitiesCache[queryString] = activities;
       allActivities = activities;
 
       // Apply search and filter, and handle weekend filter in client
       displayFilteredActivities();
     } catch (error) {
+      if (error.name === "AbortError") {
+        return;
+      }
       activitiesList.innerHTML =
         "<p>Failed to load activities. Please try again later.</p>";
+      renderedCards.clear();
       console.error("Error fetching activities:", error);
+    } finally {
+      if (activitiesRequest === controller) {
+        activitiesRequest = null;
+      }
     }
   }
 
   // Function to display filtered activities
   function displayFilteredActivities() {
-    // Clear the activities list
-    activitiesList.innerHTML = "";
-
     // Apply client-side filtering - this handles category filter and search, plus weekend filter
     let filteredActivities = {};
 
@@ -516,26 +557,127 @@ document.addEventListener("DOMContentLoaded", () => {
     });
 
     // Check if there are any results
-    if (Object.keys(filteredActivities).length === 0) {
+    visibleResults = Object.entries(filteredActivities);
+    if (visibleResults.length === 0) {
       activitiesList.innerHTML = `
         <div class="no-results">
           <h4>No activities found</h4>
           <p>Try adjusting your search or filter criteria</p>
         </div>
       `;
+      renderedCards.clear();
+      renderLimit = 0;
       return;
     }
 
-    // Display filtered activities
-    Object.entries(filteredActivities).forEach(([name, details]) => {
-      renderActivityCard(name, details);
+    // Start again from one page when the search or filters change; a refresh of
+    // the same results keeps any extra pages already scrolled into view
+    const filterKey = [
+      currentFilter,
+      currentDay,
+      currentTimeRange,
+      currentDifficulty,
+      searchQuery,
+    ].join("|");
+    const filterChanged = filterKey !== renderedFilterKey;
+    renderedFilterKey = filterKey;
+
+    renderLimit = Math.min(
+      visibleResults.length,
+      filterChanged ? RENDER_PAGE_SIZE : Math.max(renderLimit, RENDER_PAGE_SIZE)
+    );
+    reconcileActivityCards();
+  }
+
+  // Cards only need rebuilding when their data or the viewer's role changes
+  function getCardSignature(details) {
+    return `${currentUser ? "teacher" : "guest"}|${JSON.stringify(details)}`;
+  }
+
+  // Update the list to show the first renderLimit results, reusing unchanged cards
+  function reconcileActivityCards() {
+    const windowedResults = visibleResults.slice(0, renderLimit);
+    const shownNames = new Set(windowedResults.map(([name]) => name));
+
+    // Remove cards that are no longer shown, plus skeletons and messages
+    Array.from(activitiesList.children).forEach((child) => {
+      if (!shownNames.has(child.dataset.activityName)) {
+        child.remove();
+      }
     });
+    renderedCards.forEach((_, name) => {
+      if (!shownNames.has(name)) {
+        renderedCards.delete(name);
+      }
+    });
+
+    // Create or update changed cards and move them into result order
+    let previousCard = null;
+    windowedResults.forEach(([name, details]) => {
+      const signature = getCardSignature(details);
+      const existing = renderedCards.get(name);
+      let card = existing && existing.card;
+
+      if (!existing || existing.signature !== signature) {
+        card = createActivityCard(name, details);
+        if (existing) {
+          existing.card.replaceWith(card);
+        }
+        renderedCards.set(name, { card, signature });
+      }
+
+      const expectedPosition = previousCard
+        ? previousCard.nextSibling
+        : activitiesList.firstChild;
+      if (card !== expectedPosition) {
+        activitiesList.insertBefore(card, expectedPosition);
+      }
+      previousCard = card;
+    });
+
+    // The observer only fires on changes, so a sentinel that stayed in view
+    // (e.g. after a reset to one page) has to be checked after layout
+    if (renderLimit < visibleResults.length) {
+      requestAnimationFrame(loadNextPageIfNeeded);
+    }
+  }
+
+  // Render the next page of results when the end of the list scrolls into view
+  const renderSentinel = document.createElement("div");
+  renderSentinel.className = "render-sentinel";
+  activitiesList.after(renderSentinel);
+
+  const RENDER_SENTINEL_MARGIN_PX = 400;
+
+  function loadNextPageIfNeeded() {
+    if (
+      renderLimit > 0 &&
+      renderLimit < visibleResults.length &&
+      renderSentinel.getBoundingClientRect().top <
+        window.innerHeight + RENDER_SENTINEL_MARGIN_PX
+    ) {
+      renderLimit = Math.min(
+        visibleResults.length,
+        renderLimit + RENDER_PAGE_SIZE
+      );
+      reconcileActivityCards();
+    }
   }
 
-  // Function to render a single activity card
-  function renderActivityCard(name, details) {
+  new IntersectionObserver(
+    (entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        loadNextPageIfNeeded();
+      }
+    },
+    { rootMargin: `${RENDER_SENTINEL_MARGIN_PX}px` }
+  ).observe(renderSentinel);
+
+  // Function to create a single activity card
+  function createActivityCard(name, details) {
     const activityCard = document.createElement("div");
     activityCard.className = "activity-card";
+    activityCard.dataset.activityName = name;
 
     // Calculate spots and capacity
     const totalSpots = details.max_participants;
@@ -647,13 +789,14 @@ document.addEventListener("DOMContentLoaded", () => {
       }
     }
 
-    activitiesList.appendChild(activityCard);
+    return activityCard;
   }
 
   // Event listeners for search and filter
+  const debouncedSearch = debounce(displayFilteredActivities, SEARCH_DEBOUNCE_MS);
   searchInput.addEventListener("input", (event) => {
     searchQuery = event.target.value;
-    displayFilteredActivities();
+    debouncedSearch();
   });
 
   searchButton.addEventListener("click", (event) => {
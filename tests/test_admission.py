@@ -0,0 +1,230 @@
+"""
+Tests for rate limiting and admission control
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from src.app import app
+from src.backend.admission import (
+    AdmissionControlMiddleware, RateLimiter, TokenBucket, teacher_limiter,
+    TEACHER_BURST,
+)
+
+
+def make_request(path="/activities/Chess Club/signup", method="POST", query="", ip="10.0.0.1"):
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [],
+        "client": (ip, 1234),
+    })
+
+
+def make_middleware(**kwargs):
+    async def unused_app(scope, receive, send):
+        pass
+    return AdmissionControlMiddleware(unused_app, **kwargs)
+
+
+def test_token_bucket_spends_burst_then_refills_at_rate():
+    bucket = TokenBucket(rate=2, capacity=3, now=0)
+
+    assert [bucket.take(0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.take(0.25) is False
+    assert bucket.take(0.5) is True
+
+
+def test_rate_limiter_tracks_keys_independently():
+    limiter = RateLimiter(rate=1, burst=1)
+
+    assert limiter.allow("a", now=0)
+    assert not limiter.allow("a", now=0)
+    assert limiter.allow("b", now=0)
+
+
+def test_rate_limiter_evicts_least_recently_seen_keys():
+    limiter = RateLimiter(rate=0, burst=1, max_tracked_keys=2)
+    limiter.allow("old", now=0)
+    limiter.allow("recent", now=0)
+    limiter.allow("old", now=1)
+
+    # Every bucket is still empty, but the bound holds anyway
+    limiter.allow("new", now=2)
+
+    assert list(limiter.buckets) == ["old", "new"]
+
+
+def test_rate_limiter_stays_bounded_under_a_flood_of_new_keys():
+    limiter = RateLimiter(rate=0, burst=1, max_tracked_keys=100)
+
+    for i in range(1000):
+        limiter.allow(f"10.0.{i // 256}.{i % 256}", now=0)
+
+    assert len(limiter.buckets) == 100
+
+
+def test_ip_over_its_rate_is_rejected_with_429():
+    middleware = make_middleware()
+    middleware.ip_limiter = RateLimiter(rate=0, burst=1)
+
+    async def call_next(request):
+        return JSONResponse({})
+
+    async def scenario():
+        first = await middleware.dispatch(make_request(), call_next)
+        second = await middleware.dispatch(make_request(), call_next)
+        other_ip = await middleware.dispatch(make_request(ip="10.0.0.2"), call_next)
+        return first, second, other_ip
+
+    first, second, other_ip = asyncio.run(scenario())
+    assert (first.status_code, second.status_code, other_ip.status_code) == (200, 429, 200)
+    assert second.headers["Retry-After"] == "1"
+
+
+def test_reads_are_not_limited():
+    middleware = make_middleware()
+    middleware.ip_limiter = RateLimiter(rate=0, burst=0)
+
+    async def call_next(request):
+        return JSONResponse({})
+
+    response = asyncio.run(middleware.dispatch(make_request(method="GET"), call_next))
+    assert response.status_code == 200
+
+
+def test_saturated_server_rejects_with_503():
+    middleware = make_middleware(max_concurrent=1, max_queued=1, queue_timeout=0.05)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_call_next(request):
+            await release.wait()
+            return JSONResponse({})
+
+        running = asyncio.create_task(middleware.dispatch(make_request(ip="1.1.1.1"), slow_call_next))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(middleware.dispatch(make_request(ip="1.1.1.2"), slow_call_next))
+        await asyncio.sleep(0)
+        # The queue is full, so this one is turned away without waiting
+        overflow = await middleware.dispatch(make_request(ip="1.1.1.3"), slow_call_next)
+        # The queued request times out while the slot is still taken
+        timed_out = await queued
+        release.set()
+        return overflow, timed_out, await running
+
+    overflow, timed_out, running = asyncio.run(scenario())
+    assert overflow.status_code == 503
+    assert timed_out.status_code == 503
+    assert running.status_code == 200
+
+
+def test_logins_use_their_own_budget():
+    middleware = make_middleware(max_concurrent=1, max_queued=0, max_logins=1)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_call_next(request):
+            await release.wait()
+            return JSONResponse({})
+
+        login = make_request(path="/auth/login", query="username=mchen", ip="2.2.2.1")
+        running_login = asyncio.create_task(middleware.dispatch(login, slow_call_next))
+        await asyncio.sleep(0)
+
+        # A second login is rejected at once, but signups still get the general slot
+        second_login = await middleware.dispatch(
+            make_request(path="/auth/login", query="username=mchen", ip="2.2.2.2"), slow_call_next)
+        signup = asyncio.create_task(middleware.dispatch(make_request(ip="2.2.2.3"), slow_call_next))
+        await asyncio.sleep(0)
+        release.set()
+        return second_login, await signup, await running_login
+
+    second_login, signup, running_login = asyncio.run(scenario())
+    assert second_login.status_code == 503
+    assert signup.status_code == 200
+    assert running_login.status_code == 200
+
+
+def test_login_attempts_are_limited_per_ip_and_username():
+    middleware = make_middleware()
+    middleware.login_limiter = RateLimiter(rate=0, burst=1)
+    middleware.verify_budget = TokenBucket(rate=0, capacity=10, now=0)
+
+    async def call_next(request):
+        return JSONResponse({})
+
+    async def attempt(ip, username):
+        request = make_request(path="/auth/login", query=f"username={username}", ip=ip)
+        return (await middleware.dispatch(request, call_next)).status_code
+
+    async def scenario():
+        return [
+            await attempt("3.3.3.1", "mchen"),
+            await attempt("3.3.3.1", "mchen"),
+            await attempt("3.3.3.2", "mchen"),
+        ]
+
+    assert asyncio.run(scenario()) == [200, 429, 200]
+
+
+def test_password_verifications_share_a_global_rate_budget():
+    middleware = make_middleware(max_logins=10)
+    middleware.verify_budget = TokenBucket(rate=0, capacity=2, now=0)
+
+    async def call_next(request):
+        return JSONResponse({})
+
+    async def scenario():
+        statuses = []
+        for i in range(3):
+            # Every attempt comes from a different IP, so only the global budget applies
+            request = make_request(path="/auth/login", query="username=mchen", ip=f"4.4.4.{i}")
+            statuses.append((await middleware.dispatch(request, call_next)).status_code)
+        return statuses
+
+    assert asyncio.run(scenario()) == [200, 200, 503]
+
+
+def test_requests_naming_a_teacher_cannot_lock_them_out():
+    abuser = TestClient(app, client=("6.6.6.6", 1))
+    teacher = TestClient(app, client=("7.7.7.7", 1))
+
+    for _ in range(TEACHER_BURST + 5):
+        abuser.post("/activities/Nope/unregister",
+                    params={"email": "a@x", "teacher_username": "mchen"})
+
+    response = teacher.post("/activities/Nope/unregister",
+                            params={"email": "a@x", "teacher_username": "mchen"})
+    assert response.status_code == 404
+
+
+def test_unknown_teachers_are_not_charged():
+    client = TestClient(app, client=("8.8.8.8", 1))
+
+    response = client.post("/activities/Nope/unregister",
+                           params={"email": "a@x", "teacher_username": "nobody"})
+
+    assert response.status_code == 401
+    assert not any(key[0] == "nobody" for key in teacher_limiter.buckets)
+
+
+def test_teacher_over_their_rate_gets_429(monkeypatch):
+    monkeypatch.setattr(teacher_limiter, "rate", 0)
+    client = TestClient(app, client=("9.9.9.9", 1))
+
+    statuses = [
+        client.post("/activities/Nope/unregister",
+                    params={"email": "a@x", "teacher_username": "principal"}).status_code
+        for _ in range(TEACHER_BURST + 1)
+    ]
+
+    assert statuses[:TEACHER_BURST] == [404] * TEACHER_BURST
+    assert statuses[-1] == 429
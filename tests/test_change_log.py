@@ -0,0 +1,142 @@
+"""
+Tests for the activity change log and change feed endpoint
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo import ReturnDocument, UpdateOne
+
+from src.app import app
+from src.backend.change_log import ChangeLog
+from src.backend.database import ChangeLoggedCollection
+from src.backend.database_inmemory import MockCollection, initial_activities
+from src.backend.write_batcher import SIGNUP, WriteBatcher
+
+
+class FakeMongoCollection(MockCollection):
+    """Stands in for a pymongo collection and counts reads"""
+
+    def __init__(self, data_store):
+        super().__init__(data_store)
+        self.reads = 0
+        self.bulk_writes = []
+
+    def find_one(self, query):
+        self.reads += 1
+        return super().find_one(query)
+
+    def find_one_and_update(self, query, update, return_document):
+        assert return_document == ReturnDocument.AFTER
+        self.update_one(query, update)
+        return MockCollection.find_one(self, query)
+
+    def bulk_write(self, requests, ordered):
+        self.bulk_writes.append(requests)
+
+
+def test_changes_since_returns_latest_state_per_document():
+    log = ChangeLog()
+    log.append("Chess Club", {"participants": ["a@x"]})
+    log.append("Art Club", {"participants": []})
+    log.append("Chess Club", {"participants": ["a@x", "b@x"]})
+
+    latest, changes = log.changes_since(1, log.log_id)
+
+    assert latest == 3
+    assert [(change["seq"], change["name"]) for change in changes] == [
+        (2, "Art Club"), (3, "Chess Club")
+    ]
+    assert changes[1]["activity"] == {"participants": ["a@x", "b@x"]}
+
+
+def test_entries_are_snapshots():
+    log = ChangeLog()
+    document = {"participants": ["a@x"]}
+    log.append("Chess Club", document)
+    document["participants"].append("b@x")
+
+    _, changes = log.changes_since(0, log.log_id)
+
+    assert changes[0]["activity"] == {"participants": ["a@x"]}
+
+
+def test_resync_is_required_once_the_log_is_truncated():
+    log = ChangeLog(max_entries=2)
+    for i in range(3):
+        log.append("Chess Club", {"participants": [str(i)]})
+
+    assert log.changes_since(0, log.log_id) == (3, None)
+    assert log.changes_since(1, log.log_id)[1] is not None
+
+
+def test_resync_is_required_for_another_log_or_a_future_seq():
+    log = ChangeLog()
+    log.append("Chess Club", {"participants": []})
+    restarted = ChangeLog()
+    for _ in range(5):
+        restarted.append("Chess Club", {"participants": []})
+
+    # A client from before a restart must not get a partial delta
+    assert restarted.changes_since(1, log.log_id)[1] is None
+    assert restarted.changes_since(1)[1] is None
+    assert log.changes_since(2, log.log_id)[1] is None
+    assert restarted.changes_since(0)[1] is not None
+
+
+def test_listing_gives_a_position_to_poll_changes_from():
+    client = TestClient(app)
+
+    listing = client.get("/activities")
+    log_id = listing.headers["X-Change-Log-Id"]
+    seq = int(listing.headers["X-Change-Seq"])
+
+    # The initial activities are in the log, as with the MongoDB backend
+    everything = client.get("/activities/changes", params={"since": 0}).json()
+    assert everything["log_id"] == log_id
+    assert {change["name"] for change in everything["changes"]} >= set(initial_activities)
+
+    client.post("/activities/Art Club/signup",
+                params={"email": "feed@mergington.edu", "teacher_username": "mrodriguez"})
+    delta = client.get("/activities/changes", params={"since": seq, "log_id": log_id}).json()
+
+    assert delta["resync_required"] is False
+    assert [change["name"] for change in delta["changes"]] == ["Art Club"]
+    assert "feed@mergington.edu" in delta["changes"][0]["activity"]["participants"]
+
+
+def test_stale_log_id_requires_resync():
+    client = TestClient(app)
+
+    response = client.get("/activities/changes", params={"since": 1, "log_id": "old"}).json()
+
+    assert response["resync_required"] is True
+    assert response["changes"] == []
+
+
+def test_mongo_writes_are_logged_without_extra_reads():
+    log = ChangeLog()
+    fake = FakeMongoCollection({"Chess Club": {"max_participants": 5, "participants": []}})
+    collection = ChangeLoggedCollection(fake, log)
+    batcher = WriteBatcher(collection, window_seconds=0)
+
+    batcher.submit("Chess Club", SIGNUP, "a@x")
+    # One read per batch for the capacity checks, none for the change log
+    assert fake.reads == 1
+    assert fake.bulk_writes == [[UpdateOne(
+        {"_id": "Chess Club"}, {"$push": {"participants": {"$each": ["a@x"]}}})]]
+    assert log.changes_since(0, log.log_id)[1][0]["activity"]["participants"] == ["a@x"]
+
+    collection.update_one({"_id": "Chess Club"},
+                          {"$push": {"participants": {"$each": ["b@x"]}}})
+
+    assert fake.reads == 1
+    assert log.changes_since(1, log.log_id)[1][0]["activity"]["participants"] == ["b@x"]
+
+
+@pytest.mark.parametrize("method", ["update_many", "replace_one", "delete_one",
+                                    "find_one_and_update", "bulk_write"])
+def test_unlogged_mongo_writes_are_refused(method):
+    collection = ChangeLoggedCollection(FakeMongoCollection({}), ChangeLog())
+
+    with pytest.raises(AttributeError, match="change log"):
+        getattr(collection, method)
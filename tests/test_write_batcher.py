@@ -0,0 +1,156 @@
+"""
+Tests for batching signup and unregister writes
+"""
+
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from src.backend.database_inmemory import MockCollection
+from src.backend.write_batcher import WriteBatcher, WriteRejected, SIGNUP, UNREGISTER
+
+
+class RecordingCollection(MockCollection):
+    """MockCollection that remembers every bulk update it receives"""
+
+    def __init__(self, data_store):
+        super().__init__(data_store)
+        self.bulk_updates = []
+        self.documents = None
+
+    def bulk_update(self, updates, documents=None):
+        self.bulk_updates.append(updates)
+        self.documents = documents
+        return super().bulk_update(updates, documents)
+
+
+class FailingCollection(MockCollection):
+    def bulk_update(self, updates, documents=None):
+        raise RuntimeError("database unavailable")
+
+
+def make_collection(cls=RecordingCollection, max_participants=3, participants=None):
+    return cls({
+        "Chess Club": {
+            "max_participants": max_participants,
+            "participants": list(participants or []),
+        }
+    })
+
+
+def commit(batcher, operations):
+    """Commit operations as one batch and return each one's result or error"""
+    batch = [("Chess Club", operation, email, Future()) for operation, email in operations]
+    batcher._commit(batch)
+    outcomes = []
+    for *_, future in batch:
+        error = future.exception()
+        outcomes.append((error.status_code, error.detail) if error else future.result())
+    return outcomes
+
+
+def test_capacity_is_applied_in_arrival_order():
+    collection = make_collection(max_participants=3, participants=["a@x"])
+    batcher = WriteBatcher(collection, window_seconds=0)
+
+    outcomes = commit(batcher, [(SIGNUP, "b@x"), (SIGNUP, "c@x"), (SIGNUP, "d@x")])
+
+    assert outcomes[0] == {"message": "Signed up b@x for Chess Club"}
+    assert outcomes[1] == {"message": "Signed up c@x for Chess Club"}
+    assert outcomes[2] == (400, "Activity is full")
+    assert collection.data_store["Chess Club"]["participants"] == ["a@x", "b@x", "c@x"]
+
+
+def test_unregister_frees_a_spot_for_a_later_signup_in_the_same_batch():
+    collection = make_collection(max_participants=2, participants=["a@x", "b@x"])
+    batcher = WriteBatcher(collection, window_seconds=0)
+
+    outcomes = commit(batcher, [(SIGNUP, "c@x"), (UNREGISTER, "a@x"), (SIGNUP, "c@x")])
+
+    assert outcomes[0] == (400, "Activity is full")
+    assert outcomes[1] == {"message": "Unregistered a@x from Chess Club"}
+    assert outcomes[2] == {"message": "Signed up c@x for Chess Club"}
+    assert collection.data_store["Chess Club"]["participants"] == ["b@x", "c@x"]
+
+
+def test_duplicate_signup_in_the_same_batch_is_rejected():
+    collection = make_collection()
+    batcher = WriteBatcher(collection, window_seconds=0)
+
+    outcomes = commit(batcher, [(SIGNUP, "a@x"), (SIGNUP, "a@x")])
+
+    assert outcomes[0] == {"message": "Signed up a@x for Chess Club"}
+    assert outcomes[1] == (400, "Already signed up for this activity")
+    assert collection.data_store["Chess Club"]["participants"] == ["a@x"]
+
+
+def test_signup_unregister_signup_runs_are_written_in_order():
+    collection = make_collection()
+    batcher = WriteBatcher(collection, window_seconds=0)
+
+    outcomes = commit(batcher, [
+        (SIGNUP, "a@x"), (SIGNUP, "b@x"), (UNREGISTER, "a@x"), (SIGNUP, "a@x"),
+    ])
+
+    assert all(isinstance(outcome, dict) for outcome in outcomes)
+    assert collection.bulk_updates == [[
+        ({"_id": "Chess Club"}, {"$push": {"participants": {"$each": ["a@x", "b@x"]}}}),
+        ({"_id": "Chess Club"}, {"$pull": {"participants": {"$in": ["a@x"]}}}),
+        ({"_id": "Chess Club"}, {"$push": {"participants": {"$each": ["a@x"]}}}),
+    ]]
+    assert collection.data_store["Chess Club"]["participants"] == ["b@x", "a@x"]
+    # The final state is passed along so the change log needs no extra read
+    assert collection.documents["Chess Club"]["participants"] == ["b@x", "a@x"]
+
+
+def test_unknown_activity_and_missing_participant_are_rejected():
+    batcher = WriteBatcher(make_collection(), window_seconds=0)
+
+    with pytest.raises(WriteRejected) as missing_activity:
+        batcher.submit("Nope", SIGNUP, "a@x")
+    with pytest.raises(WriteRejected) as missing_participant:
+        batcher.submit("Chess Club", UNREGISTER, "a@x")
+
+    assert missing_activity.value.status_code == 404
+    assert missing_participant.value.detail == "Not registered for this activity"
+
+
+def test_concurrent_submissions_share_one_bulk_update():
+    collection = make_collection(max_participants=10)
+    batcher = WriteBatcher(collection, window_seconds=0.2)
+    results = []
+
+    def sign_up(email):
+        results.append(batcher.submit("Chess Club", SIGNUP, email))
+
+    threads = [threading.Thread(target=sign_up, args=(f"s{i}@x",)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 5
+    assert len(collection.bulk_updates) == 1
+    assert len(collection.data_store["Chess Club"]["participants"]) == 5
+
+
+def test_commit_failure_fails_every_waiting_request(caplog):
+    batcher = WriteBatcher(make_collection(FailingCollection, max_participants=10),
+                           window_seconds=0.2)
+    errors = []
+
+    def sign_up(email):
+        try:
+            batcher.submit("Chess Club", SIGNUP, email)
+        except WriteRejected as e:
+            errors.append((e.status_code, e.detail))
+
+    threads = [threading.Thread(target=sign_up, args=(f"s{i}@x",)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [(500, "Failed to update activity")] * 3
+    assert "database unavailable" in caplog.text